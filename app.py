@@ -1,13 +1,206 @@
+import io
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.compute as pc
 from collections import defaultdict
+from functools import reduce
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import datashader as ds
+    import datashader.transfer_functions as ds_tf
+except ImportError:
+    ds = None
+
+try:
+    import numexpr  # noqa: F401
+    EVAL_ENGINE = "numexpr"
+    pd.set_option("compute.use_numexpr", True)
+except ImportError:
+    EVAL_ENGINE = "python"
+
+# Cap on points handed to Plotly; anything beyond this is downsampled
+MAX_PLOT_POINTS = 2000
+
+# Above this, scatters are rasterized server-side and histograms pre-binned
+RASTER_THRESHOLD = 100_000
+
+def _convert_int(s):
+    # to_numeric's downcast never crosses kinds, so float columns need an
+    # explicit cast; truncate like astype(int) but keep missing as nulls
+    num = pd.to_numeric(s, errors="coerce")
+    if pd.api.types.is_integer_dtype(num):
+        return pd.to_numeric(num, downcast="integer")
+    vals = np.trunc(num.astype("Float64").to_numpy(dtype="float64", na_value=np.nan))
+    return pd.Series(vals, index=num.index).astype("int64[pyarrow]")
+
+def _convert_float(s):
+    num = pd.to_numeric(s, errors="coerce")
+    if pd.api.types.is_float_dtype(num):
+        return pd.to_numeric(num, downcast="float")
+    return num.astype("float64[pyarrow]")
+
+# Typed converters for the "Convert to Type" path. to_datetime(cache=True)
+# parses each unique string once, and to_numeric uses the Cython scalar
+# parser; generic astype would fall back to slow per-row parsing for
+# datetimes on object columns.
+CONV = {
+    "datetime": lambda s: pd.to_datetime(s, errors="coerce", cache=True),
+    "int": _convert_int,
+    "float": _convert_float,
+    "string": lambda s: s.astype("string[pyarrow]"),
+}
+
+# Row count beyond which groupby/sort/dedupe are offloaded to Polars,
+# which runs them in parallel across cores (when polars is installed)
+POLARS_THRESHOLD = 1_000_000
+
+def use_polars(df):
+    return pl is not None and len(df) > POLARS_THRESHOLD
+
+def substring_mask(col, value):
+    # Run Arrow's match_substring kernel directly on the column's Arrow
+    # buffer: one C++ SIMD scan, no pandas string-accessor overhead.
+    arr = col.array._pa_array if hasattr(col.array, "_pa_array") else pa.Array.from_pandas(col.astype("string[pyarrow]"))
+    if not (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+        arr = pc.cast(arr, pa.string())
+    return pc.fill_null(pc.match_substring(arr, value), False).to_numpy(zero_copy_only=False).astype(bool)
+
+def apply_op(df, op):
+    # One deferred transformation recorded by a button press. Ops are
+    # replayed over the pristine loaded frame instead of mutating it in
+    # place, so pandas consolidates blocks once per rerun rather than on
+    # every widget interaction.
+    kind = op[0]
+    if kind == "convert" and op[1] in df.columns:
+        convert = CONV.get(op[2], lambda s, dtype=op[2]: s.astype(dtype))
+        df = df.assign(**{op[1]: convert(df[op[1]])})
+    elif kind == "sort" and op[1] in df.columns:
+        if use_polars(df):
+            df = pl.from_pandas(df).sort(op[1], descending=not op[2]).to_pandas()
+        else:
+            df = df.sort_values(by=op[1], ascending=op[2])
+    elif kind == "set_index" and op[1] in df.columns:
+        df = df.set_index(op[1])
+    return df
+
+@st.cache_data
+def materialize(_base, file_id, version, ops, dropped_columns, dropped_rows):
+    # _base is excluded from the cache key; file_id identifies the upload
+    # and version/ops/dropped_columns/dropped_rows fingerprint the
+    # recorded state. Dropped rows are removed here so every section of
+    # the app sees the masked frame.
+    #
+    # set_index ops replay last: they replace the row labels that
+    # dropped_rows are keyed on but never reorder rows, so deferring them
+    # keeps the pristine labels of the loaded frame valid for the row
+    # mask. Those labels are returned alongside the view so the Row
+    # Management controls can map positions back to them.
+    df = _base.drop(columns=[c for c in dropped_columns if c in _base.columns])
+    df = reduce(apply_op, [op for op in ops if op[0] != "set_index"], df)
+    if dropped_rows:
+        df = df.loc[~df.index.isin(dropped_rows)]
+    row_labels = df.index.to_numpy()
+    df = reduce(apply_op, [op for op in ops if op[0] == "set_index"], df)
+    return df, row_labels
+
+def _view(file, settings, dropped_rows):
+    return materialize(
+        st.session_state.datasets[file.name],
+        file.file_id,
+        settings["version"],
+        tuple(settings["ops"]),
+        tuple(sorted(settings["dropped_columns"])),
+        dropped_rows,
+    )
+
+def current_view(file, settings):
+    return _view(file, settings, tuple(sorted(settings["dropped_rows"], key=str)))[0]
+
+def shrink_dtypes(df):
+    # Downcast numerics and turn low-cardinality string columns into
+    # categoricals so later groupby/sort/merge move less memory.
+    for c in df.columns:
+        col = df[c]
+        if pd.api.types.is_bool_dtype(col):
+            continue
+        if pd.api.types.is_numeric_dtype(col):
+            downcast = 'integer' if pd.api.types.is_integer_dtype(col) else 'float'
+            df[c] = pd.to_numeric(col, downcast=downcast)
+        elif pd.api.types.is_string_dtype(col) or pd.api.types.is_object_dtype(col):
+            if len(df) and col.nunique() / len(df) < 0.5:
+                df[c] = col.astype('category')
+    return df
+
+# Cached helpers: Streamlit reruns the whole script on every widget change,
+# so file parsing and expensive frame-wide computations are memoized here.
+@st.cache_data
+def load_df(name, raw):
+    if name.endswith('.csv'):
+        # Arrow's CSV reader is multithreaded and keeps strings dictionary-encoded
+        df = pd.read_csv(io.BytesIO(raw), engine="pyarrow", dtype_backend="pyarrow")
+    else:
+        df = pd.read_excel(io.BytesIO(raw), engine="calamine")
+    return shrink_dtypes(df.convert_dtypes(dtype_backend="pyarrow"))
+
+@st.cache_data
+def corr_cached(df):
+    return df.corr(numeric_only=True)
+
+@st.cache_data
+def describe_cached(df):
+    return df.describe()
+
+@st.cache_data
+def preview(df, n=5):
+    return df.head(n)
+
+def _lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: keep the point per bucket that forms
+    # the largest triangle with the previous pick and the next bucket mean.
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1, dtype=np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        nxt_y = y[hi:nxt_hi]
+        good = ~np.isnan(nxt_y)
+        avg_x = x[hi:nxt_hi].mean() if hi < nxt_hi else x[-1]
+        avg_y = nxt_y[good].mean() if good.any() else y[a]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (y[a] - avg_y))
+        # A bucket of all-NaN values (a gap in the series) has no best
+        # point; keep its first index rather than letting nanargmax raise
+        a = lo + (int(np.nanargmax(area)) if not np.isnan(area).all() else 0)
+        idx[i + 1] = a
+    return idx
+
+def downsample_for_plot(df, x_col, y_col, n_out=MAX_PLOT_POINTS):
+    # Only O(n_out) points are distinguishable on screen anyway; LTTB keeps
+    # the visual shape while cutting what gets serialized to the browser.
+    if len(df) <= n_out:
+        return df
+    x, y = df[x_col], df[y_col]
+    if pd.api.types.is_numeric_dtype(x) and pd.api.types.is_numeric_dtype(y) and x.is_monotonic_increasing:
+        xv = x.astype("Float64").to_numpy(dtype="float64", na_value=np.nan)
+        yv = y.astype("Float64").to_numpy(dtype="float64", na_value=np.nan)
+        return df.iloc[_lttb_indices(xv, yv, n_out)]
+    # Non-numeric or unsorted axes: fall back to a uniform stride
+    return df.iloc[:: -(-len(df) // n_out)]
 
 # Initialize session state for user settings and datasets
 if "user_settings" not in st.session_state:
-    st.session_state.user_settings = defaultdict(lambda: {"dropped_columns": [], "dropped_rows": [], "dropped_rows_df": pd.DataFrame(), "dropped_columns_df": pd.DataFrame()})
+    st.session_state.user_settings = defaultdict(lambda: {"dropped_columns": set(), "dropped_rows": set(), "ops": [], "version": 0, "cols": None, "cols_version": -1})
 
 if "datasets" not in st.session_state:
     st.session_state.datasets = {}
@@ -31,65 +224,96 @@ def main():
     datasets = []
     if uploaded_files:
         for file in uploaded_files:
-            if file.name not in st.session_state.datasets:
-                try:
-                    if file.name.endswith('.csv'):
-                        data = pd.read_csv(file)
-                    else:
-                        data = pd.read_excel(file)
-                    st.session_state.datasets[file.name] = data
-                except Exception as e:
-                    st.error(f"Failed to load {file.name}: {str(e)}")
-                    continue
+            try:
+                st.session_state.datasets[file.name] = load_df(file.name, file.getvalue())
+            except Exception as e:
+                st.error(f"Failed to load {file.name}: {str(e)}")
+                continue
 
-            data = st.session_state.datasets[file.name]
             settings = st.session_state.user_settings[file.name]
+            data = current_view(file, settings)
+
+            # Column buckets are rebuilt only when the frame changes; the
+            # selectboxes below reuse these tuples instead of materializing
+            # data.columns once per widget on every rerun
+            if settings["cols"] is None or settings["cols_version"] != settings["version"]:
+                settings["cols"] = {"all": tuple(data.columns), "num": tuple(data.select_dtypes("number").columns)}
+                settings["cols_version"] = settings["version"]
+            cols = settings["cols"]
 
             st.subheader(f"Data Preview for {file.name}")
-            st.dataframe(data.head())
+            st.dataframe(preview(data))
 
             # Data cleaning and management options for each file
             with st.expander(f"Data Cleaning and Management for {file.name}"):
                 # Handle Duplicates
                 st.markdown("### Handle Duplicates")
                 if st.checkbox(f"Remove Duplicates from {file.name}"):
-                    data = data.drop_duplicates()
+                    if use_polars(data):
+                        data = pl.from_pandas(data).unique(maintain_order=True).to_pandas()
+                    else:
+                        # One vectorized 64-bit hash per row instead of
+                        # drop_duplicates' per-row tuple hashing; row labels
+                        # are kept so the row-management mask stays valid
+                        row_hash = pd.util.hash_pandas_object(data, index=False)
+                        data = data.loc[~row_hash.duplicated().to_numpy()]
                     st.write("Duplicates removed.")
-                    st.dataframe(data.head())
+                    st.dataframe(preview(data))
 
                 # Handle Data Types conversion
                 st.markdown("### Handle Data Types")
-                column_to_convert = st.selectbox(f"Select Column to Convert in {file.name}", data.columns, key=f"convert_{file.name}")
+                column_to_convert = st.selectbox(f"Select Column to Convert in {file.name}", cols["all"], key=f"convert_{file.name}")
                 dtype_option = st.selectbox(f"Convert to Type in {file.name}", ["int", "float", "string", "datetime"], key=f"dtype_{file.name}")
                 if st.button(f"Convert Column in {file.name}"):
                     try:
-                        data[column_to_convert] = data[column_to_convert].astype(dtype_option)
+                        data = apply_op(data, ("convert", column_to_convert, dtype_option))
+                        settings["ops"].append(("convert", column_to_convert, dtype_option))
+                        settings["version"] += 1
                         st.success(f"Column '{column_to_convert}' converted to {dtype_option}.")
                     except Exception as e:
                         st.error(f"Error converting column: {str(e)}")
 
                 # Sorting Data
                 st.markdown("### Sorting")
-                sort_col = st.selectbox(f"Select Column to Sort in {file.name}", data.columns, key=f"sort_{file.name}")
+                sort_col = st.selectbox(f"Select Column to Sort in {file.name}", cols["all"], key=f"sort_{file.name}")
                 sort_ascending = st.checkbox(f"Sort in Ascending Order in {file.name}", value=True, key=f"ascending_{file.name}")
                 if st.button(f"Sort Data in {file.name}"):
-                    data = data.sort_values(by=sort_col, ascending=sort_ascending)
-                    st.dataframe(data.head())
+                    data = apply_op(data, ("sort", sort_col, sort_ascending))
+                    settings["ops"].append(("sort", sort_col, sort_ascending))
+                    settings["version"] += 1
+                    st.dataframe(preview(data))
 
                 # Grouping and Aggregating Data
                 st.markdown("### Group By and Aggregate")
-                group_col = st.selectbox(f"Select Column to Group By in {file.name}", data.columns, key=f"group_{file.name}")
+                group_col = st.selectbox(f"Select Column to Group By in {file.name}", cols["all"], key=f"group_{file.name}")
                 agg_func = st.selectbox(f"Select Aggregation Function for {file.name}", ["sum", "mean", "count", "min", "max"], key=f"agg_{file.name}")
                 if st.button(f"Group and Aggregate in {file.name}"):
-                    grouped_data = data.groupby(group_col).agg(agg_func)
+                    if use_polars(data):
+                        grouped = pl.from_pandas(data).group_by(group_col, maintain_order=True)
+                        if agg_func == "count":
+                            grouped_data = grouped.agg(pl.exclude(group_col).count()).to_pandas()
+                        else:
+                            numeric = [c for c, dt in pl.from_pandas(data.head(0)).schema.items() if dt.is_numeric() and c != group_col]
+                            grouped_data = grouped.agg(getattr(pl.col(numeric), agg_func)()).to_pandas()
+                    else:
+                        # Call the typed reduction directly instead of agg(name):
+                        # stays on the Cython fast path, skips the key sort, and
+                        # ignores unobserved category groups.
+                        grouped = data.groupby(group_col, sort=False, observed=True, as_index=False)
+                        if agg_func == "count":
+                            grouped_data = grouped.count()
+                        else:
+                            grouped_data = getattr(grouped, agg_func)(numeric_only=True)
                     st.dataframe(grouped_data)
 
                 # Set Index
                 st.markdown("### Set Index")
-                index_col = st.selectbox(f"Select Column to Set as Index in {file.name}", data.columns, key=f"index_{file.name}")
+                index_col = st.selectbox(f"Select Column to Set as Index in {file.name}", cols["all"], key=f"index_{file.name}")
                 if st.button(f"Set Index in {file.name}"):
-                    data.set_index(index_col, inplace=True)
-                    st.dataframe(data.head())
+                    data = apply_op(data, ("set_index", index_col))
+                    settings["ops"].append(("set_index", index_col))
+                    settings["version"] += 1
+                    st.dataframe(preview(data))
 
             # Data Preprocessing Options (e.g., filling missing values)
             with st.expander(f"Data Cleaning and Preprocessing Options for {file.name}"):
@@ -97,7 +321,27 @@ def main():
                     data = data.dropna()
                 if st.checkbox(f"Fill Missing Values in {file.name}"):
                     fill_value = st.text_input(f"Enter value to fill missing cells in {file.name}", "0")
-                    data = data.fillna(fill_value)
+                    try:
+                        # Coerce the text input per column: Arrow-backed
+                        # numeric and datetime columns reject a string fill
+                        fills = {}
+                        for c in data.columns:
+                            col = data[c]
+                            if isinstance(col.dtype, pd.CategoricalDtype):
+                                continue
+                            if pd.api.types.is_numeric_dtype(col):
+                                num = pd.to_numeric(fill_value, errors="coerce")
+                                if not pd.isna(num):
+                                    fills[c] = num
+                            elif pd.api.types.is_datetime64_any_dtype(col):
+                                ts = pd.to_datetime(fill_value, errors="coerce")
+                                if not pd.isna(ts):
+                                    fills[c] = ts
+                            else:
+                                fills[c] = fill_value
+                        data = data.fillna(fills)
+                    except Exception as e:
+                        st.error(f"Fill error: {str(e)}")
                 if st.checkbox(f"Rename Columns in {file.name}"):
                     # Select the column to rename
                     column_to_rename = st.selectbox("Select Column to Rename", data.columns)
@@ -109,97 +353,91 @@ def main():
                     if new_column_name:
                         data.rename(columns={column_to_rename: new_column_name}, inplace=True)
                         st.success(f"Column '{column_to_rename}' renamed to '{new_column_name}'")
-                st.dataframe(data.head())
+                st.dataframe(preview(data))
 
             # Row and Column Management
             with st.expander(f"Manage Rows/Columns for {file.name}"):
-                settings = st.session_state.setdefault("user_settings", {}).setdefault(file.name, {"dropped_columns": [], "dropped_rows": []})
-
                 # Column Management
                 st.markdown("### Column Management")
-                available_columns = [col for col in data.columns if col not in settings["dropped_columns"]]
+                # Index.isin runs the membership test in hashed C instead of a
+                # Python loop, and keeps the original column order
+                available_columns = list(data.columns[~data.columns.isin(settings["dropped_columns"])])
                 drop_columns = st.multiselect(f"Select Columns to Drop for {file.name}", available_columns)
                 if st.button(f"Drop Selected Columns ({file.name})"):
                     try:
-                        # Store dropped columns in a temporary DataFrame
-                        dropped_columns_df = data[drop_columns].copy()  # Save the dropped columns to restore later
-                        settings["dropped_columns_df"] = dropped_columns_df  # Store it in the session state
-
-                        # Drop the columns from the main DataFrame
-                        data.drop(columns=drop_columns, inplace=True)
-                        settings["dropped_columns"].extend(drop_columns)
+                        # The loaded frame stays intact, so dropped columns
+                        # need no backup copy: the set alone drives materialize
+                        data = data.drop(columns=drop_columns)
+                        settings["dropped_columns"].update(drop_columns)
+                        settings["version"] += 1
 
                         st.success(f"Dropped columns: {', '.join(drop_columns)}")
-                        st.dataframe(data.head())
+                        st.dataframe(preview(data))
                     except Exception as e:
                         st.error(f"Column drop error: {str(e)}")
 
-                restore_columns = st.multiselect(f"Select Columns to Restore for {file.name}", settings["dropped_columns"])
+                restore_columns = st.multiselect(f"Select Columns to Restore for {file.name}", sorted(settings["dropped_columns"]))
                 if st.button(f"Restore Selected Columns ({file.name})"):
                     try:
-                        # Ensure we have stored dropped columns in `dropped_columns_df`
-                        if settings["dropped_columns_df"].empty:
-                            st.warning("No columns to restore.")
-                        else:
-                            # Get the columns to restore based on the column names
-                            restored_columns = settings["dropped_columns_df"][restore_columns].copy()
-
-                            # Concatenate the restored columns back into the original DataFrame
-                            data = pd.concat([data, restored_columns], axis=1)
-
-                            # Update the session state with the restored data
-                            st.session_state.datasets[file.name] = data.copy()
+                        settings["dropped_columns"] -= set(restore_columns)
+                        settings["version"] += 1
+                        data = current_view(file, settings)
 
-                            # Remove restored columns from dropped columns list
-                            settings["dropped_columns"] = [col for col in settings["dropped_columns"] if col not in restore_columns]
-
-                            st.success(f"Restored columns: {', '.join(restore_columns)}")
-                            st.dataframe(data.head())
+                        st.success(f"Restored columns: {', '.join(restore_columns)}")
+                        st.dataframe(preview(data))
                     except Exception as e:
                         st.error(f"Column restore error: {str(e)}")
 
-                # Row Management (no changes, remains the same as previous)
+                # Row Management
                 st.markdown("### Row Management")
-                available_rows = list(data.index.difference(settings["dropped_rows"]))
-                drop_rows = st.multiselect(f"Select Rows to Drop for {file.name}", available_rows)
-                if st.button(f"Drop Selected Rows ({file.name})"):
+                # Dropped rows are remembered by the pristine labels of the
+                # loaded frame and removed inside materialize, so every
+                # section sees them gone and drops survive Set Index. The
+                # controls here address the unmasked view so dropped rows
+                # can still be selected for restore; rows are addressed by
+                # position range or a search string instead of serializing
+                # every index label into a multiselect.
+                dropped_rows = settings["dropped_rows"]
+                full_view, full_labels = _view(file, settings, ())
+
+                n_rows = len(full_view)
+                row_range = st.text_input(f"Row positions to select in {file.name} (e.g. 0-99)", "", key=f"row_range_{file.name}")
+                row_query = st.text_input(f"Or select rows whose values contain ({file.name})", "", key=f"row_query_{file.name}")
+                positions = np.empty(0, dtype=np.int64)
+                if row_query:
+                    hit = np.zeros(n_rows, dtype=bool)
+                    for c in full_view.columns:
+                        hit |= substring_mask(full_view[c], row_query)
+                    positions = np.flatnonzero(hit)
+                elif row_range:
                     try:
-                        # Store dropped rows in a temporary DataFrame
-                        dropped_rows_df = data.loc[drop_rows].copy()  # Save the rows to restore later
-                        settings["dropped_rows_df"] = dropped_rows_df  # Store it in the session state
-
-                        # Now drop the rows from the main dataframe
-                        data.drop(index=drop_rows, inplace=True)
-                        settings["dropped_rows"].extend(drop_rows)
+                        lo, _, hi = row_range.partition("-")
+                        start_row, end_row = int(lo), int(hi) if hi else int(lo)
+                        positions = np.arange(max(start_row, 0), min(end_row, n_rows - 1) + 1)
+                    except ValueError:
+                        st.error(f"Invalid row range: {row_range}")
 
-                        st.success(f"Dropped rows: {', '.join(map(str, drop_rows))}")
-                        st.dataframe(data.head())
-                    except Exception as e:
-                        st.error(f"Row drop error: {str(e)}")
+                if st.button(f"Drop Selected Rows ({file.name})"):
+                    if positions.size:
+                        dropped_rows.update(full_labels[positions])
+                        settings["version"] += 1
+                        data = current_view(file, settings)
+                        st.success(f"Dropped {positions.size} row(s).")
+                    else:
+                        st.warning("No rows selected.")
 
-                restore_rows = st.multiselect(f"Select Rows to Restore for {file.name}", settings["dropped_rows"])
                 if st.button(f"Restore Selected Rows ({file.name})"):
-                    try:
-                        # Ensure we have stored dropped rows in `dropped_rows_df`
-                        if settings["dropped_rows_df"].empty:
-                            st.warning("No rows to restore.")
-                        else:
-                            # Get the rows to restore based on the original index
-                            restored_rows = settings["dropped_rows_df"].loc[settings["dropped_rows_df"].index.isin(restore_rows)].copy()
-
-                            # Concatenate the restored rows back into the original DataFrame
-                            data = pd.concat([data, restored_rows]).sort_index()
-
-                            # Update the session state with the restored data
-                            st.session_state.datasets[file.name] = data.copy()
-
-                            # Remove restored rows from dropped rows list
-                            settings["dropped_rows"] = [row for row in settings["dropped_rows"] if row not in restore_rows]
+                    if positions.size:
+                        dropped_rows.difference_update(full_labels[positions])
+                        settings["version"] += 1
+                        data = current_view(file, settings)
+                        st.success(f"Restored {positions.size} row(s).")
+                    else:
+                        st.warning("No rows selected.")
 
-                            st.success(f"Restored rows: {', '.join(map(str, restore_rows))}")
-                            st.dataframe(data.head())
-                    except Exception as e:
-                        st.error(f"Row restore error: {str(e)}")
+                active = n_rows - int(np.isin(full_labels, list(dropped_rows)).sum()) if dropped_rows else n_rows
+                st.caption(f"{active} of {n_rows} rows active")
+                st.dataframe(preview(data))
 
 
 
@@ -214,60 +452,100 @@ def main():
                 st.warning("Merging requires specifying key columns manually for demo.")
                 merge_on = st.text_input("Enter column name to merge on (same for all files):")
                 data = datasets[0]
-                for df in datasets[1:]:
-                    data = data.merge(df, on=merge_on, how="inner") if merge_on else data
+                if merge_on:
+                    try:
+                        # Join on a shared index: each frame is hashed once and
+                        # sort=False skips the final key sort, instead of
+                        # re-hashing the growing result on every merge. Each
+                        # join gets its own suffix so files sharing non-key
+                        # column names (e.g. same-schema monthly exports)
+                        # don't collide on a repeated suffix.
+                        indexed = [df.set_index(merge_on) for df in datasets]
+                        data = indexed[0]
+                        for i, right in enumerate(indexed[1:], start=1):
+                            data = data.join(right, how="inner", sort=False, rsuffix=f"_{i}")
+                        data = data.reset_index()
+                    except Exception as e:
+                        st.error(f"Merge error: {str(e)}")
+                        data = datasets[0]
 
         st.subheader("Combined Data Preview")
-        st.dataframe(data.head())
+        st.dataframe(preview(data))
 
         # Filtering and Custom Formula Inputs
         with st.expander("Custom Filtering and Formulas"):
             col_to_filter = st.selectbox("Select Column to Filter", data.columns)
             filter_value = st.text_input("Enter value to filter by")
             if st.button("Apply Filter"):
-                data = data[data[col_to_filter].astype(str).str.contains(filter_value)]
-                st.dataframe(data.head())
+                data = data.loc[substring_mask(data[col_to_filter], filter_value)]
+                st.dataframe(preview(data))
 
             custom_formula = st.text_area("Enter a formula using column names (e.g., `NewCol = ColA + ColB * 2`)")
             if custom_formula:
                 try:
                     col_name, expression = custom_formula.split("=")
-                    data[col_name.strip()] = data.eval(expression.strip())
+                    # numexpr fuses the expression into one blocked C loop
+                    # instead of materializing an ndarray per operator
+                    data[col_name.strip()] = data.eval(expression.strip(), engine=EVAL_ENGINE)
                     st.success(f"Formula applied: {custom_formula}")
                 except Exception as e:
                     st.error(f"Error applying formula: {str(e)}")
-            st.dataframe(data.head())
+            st.dataframe(preview(data))
 
         # Visualization (unchanged from the previous code)
         st.markdown("### Data Visualization")
-        x_col = st.selectbox(f"Select X-axis Column for {file.name}", data.columns)
-        y_col = st.selectbox(f"Select Y-axis Column for {file.name}", data.columns)
+        plot_cols = {"all": tuple(data.columns), "num": tuple(data.select_dtypes("number").columns)}
         plot_type = st.selectbox(f"Select Plot Type for {file.name}", ["Scatter Plot", "Line Plot", "Bar Plot", "Histogram", "Box Plot", "Heatmap"])
+        # Scatter/line axes are numeric-only: object axes force Plotly into
+        # per-category handling and defeat the WebGL/downsampling paths
+        axis_cols = plot_cols["num"] if plot_type in ("Scatter Plot", "Line Plot") else plot_cols["all"]
+        x_col = st.selectbox(f"Select X-axis Column for {file.name}", axis_cols)
+        y_col = st.selectbox(f"Select Y-axis Column for {file.name}", axis_cols)
 
         if st.button(f"Generate Plot for {file.name}"):
             try:
+                fig = None
+                # SVG traces emit one DOM node per point and stall beyond
+                # ~1000 points; WebGL rasterizes on the GPU instead
+                render_mode = "webgl" if len(data) > 1000 else "svg"
                 if plot_type == "Scatter Plot":
-                    fig = px.scatter(data, x=x_col, y=y_col)
+                    if ds is not None and len(data) > RASTER_THRESHOLD:
+                        # Aggregate every point onto a fixed-size canvas in
+                        # one pass; the shipped image size is independent of
+                        # the row count
+                        canvas = ds.Canvas(plot_width=800, plot_height=600)
+                        agg = canvas.points(data[[x_col, y_col]].astype("float64"), x_col, y_col)
+                        st.image(ds_tf.shade(agg).to_pil(), caption=f"{y_col} vs {x_col} ({len(data):,} points, rasterized)")
+                    else:
+                        fig = px.scatter(downsample_for_plot(data, x_col, y_col), x=x_col, y=y_col, render_mode=render_mode)
                 elif plot_type == "Line Plot":
-                    fig = px.line(data, x=x_col, y=y_col)
+                    fig = px.line(downsample_for_plot(data, x_col, y_col), x=x_col, y=y_col, render_mode=render_mode)
                 elif plot_type == "Bar Plot":
                     fig = px.bar(data, x=x_col, y=y_col)
                 elif plot_type == "Histogram":
-                    fig = px.histogram(data, x=x_col)
+                    if len(data) > RASTER_THRESHOLD and pd.api.types.is_numeric_dtype(data[x_col]):
+                        # Bin server-side so 50 bars cross the wire instead of
+                        # every raw value
+                        xv = data[x_col].astype("Float64").to_numpy(dtype="float64", na_value=np.nan)
+                        counts, edges = np.histogram(xv[~np.isnan(xv)], bins=50)
+                        fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, labels={"x": x_col, "y": "count"})
+                    else:
+                        fig = px.histogram(data, x=x_col)
                 elif plot_type == "Box Plot":
                     fig = px.box(data, x=x_col, y=y_col)
                 elif plot_type == "Heatmap":
-                    corr = data.corr()
-                    fig = sns.heatmap(corr, annot=True, cmap="coolwarm")
-                    st.pyplot(plt.gcf())
-                st.plotly_chart(fig)
+                    # Ship only the corr matrix to the browser instead of
+                    # rasterizing a matplotlib figure server-side
+                    fig = px.imshow(corr_cached(data), text_auto=".2f", aspect="auto", color_continuous_scale="RdBu_r")
+                if fig is not None:
+                    st.plotly_chart(fig)
             except Exception as e:
                 st.error(f"Visualization error: {str(e)}")
 
         st.write("#### Descriptive Statistics")
         if st.button("Show Descriptive Statistics of the new file"):
             try:
-                st.write(data.describe())
+                st.write(describe_cached(data))
             except Exception as e:
                 st.error(f"Statistics error: {str(e)}")
 
@@ -276,10 +554,13 @@ def main():
         st.subheader("Generate Report")
         report_file = "cleaned_data_report.xlsx"
         if st.button("Export and Download Report"):
-            with pd.ExcelWriter(report_file, engine='openpyxl') as writer:
+            # Write straight into memory: xlsxwriter streams rows without
+            # openpyxl's per-cell Python objects, and BytesIO avoids the
+            # write-to-disk-then-reread round trip
+            buf = io.BytesIO()
+            with pd.ExcelWriter(buf, engine='xlsxwriter') as writer:
                 data.to_excel(writer, index=False, sheet_name="Cleaned Data")
-            with open(report_file, "rb") as file:
-                st.download_button("Download Cleaned Report", file, file_name=report_file)
+            st.download_button("Download Cleaned Report", buf.getvalue(), file_name=report_file)
 
 if __name__ == "__main__":
     main()